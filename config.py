@@ -2,21 +2,36 @@ from dataclasses import dataclass
 import math
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CableType:
     name: str
     capacity: float
     cost_per_meter: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TransformerType:
     name: str
     rated_power: int
     cost: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class ExportRates:
+    """
+    Distance-independent part of the export cost: cost per meter of the cheapest MV and
+    HV export bundles plus the fixed cost of the transformers HV export needs.
+    transformer_usage holds (transformer name, count) pairs, so the rates are immutable
+    and hashable. It is None when HV export is unavailable.
+    """
+
+    mv_cost_per_meter: float
+    hv_cost_per_meter: float
+    transformer_cost: float
+    transformer_usage: tuple[tuple[str, int], ...] | None
+
+
+@dataclass(slots=True)
 class Node:
     node_id: int
     x: float
@@ -27,10 +42,10 @@ def get_dist(node1: Node, node2: Node) -> float:
     """
     Euclidean distance.
     """
-    return math.sqrt((node1.x - node2.x) ** 2 + (node1.y - node2.y) ** 2)
+    return math.hypot(node1.x - node2.x, node1.y - node2.y)
 
 
-@dataclass
+@dataclass(slots=True)
 class Edge:
     node1: Node
     node2: Node
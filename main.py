@@ -1,9 +1,21 @@
 import pathlib
 import logging
+import numpy as np
 import pandas as pd
+import matplotlib
+
+matplotlib.use("Agg")  # figures are only saved to file, never shown
+
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from config import CableType, TransformerType, Edge
-from network import Turbine, CCP, design_collection_network
+from network import (
+    Turbine,
+    CCP,
+    design_collection_network,
+    get_coords,
+    pairwise_dist_sq,
+)
 from optimizer import optimize_ccp_on_ray
 
 FIG_DPI = 200
@@ -13,8 +25,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def generate_turbine_layout(num_rows: int, num_cols: int) -> list[Turbine]:
+def generate_turbine_layout(
+    num_rows: int, num_cols: int
+) -> tuple[list[Turbine], np.ndarray]:
+    """
+    Returns the turbines along with their coordinates as a V x 2 array.
+    """
     turbines = []
+    coords = []
     node_id = 1  # 0 is reserved for the CCP
     for row in range(num_rows):
         leftmost_x = 25000 if row % 2 == 0 else 25250
@@ -22,159 +40,162 @@ def generate_turbine_layout(num_rows: int, num_cols: int) -> list[Turbine]:
         for col in range(num_cols):
             x = leftmost_x + 500 * col
             turbines.append(Turbine(node_id, x, y))
+            coords.append((x, y))
             node_id += 1
-    return turbines
+    return turbines, np.array(coords, dtype=np.float64)
 
 
 def generate_collection_procurement(edges: list[Edge]) -> pd.DataFrame:
-    columns = [
-        "node1_id",
-        "node1_x",
-        "node1_y",
-        "node2_id",
-        "node2_x",
-        "node2_y",
-        "cable_type",
-        "num_cables",
-        "max_power",
-        "flow",
-        "distance",
-        "cost",
-    ]
-    result = {}
-
-    for column in columns:
-        result[column] = []
-
+    cable_types: list[CableType] = []
     for edge in edges:
         if edge.cable_type is None:
             raise ValueError("Found edge with undetermined cable type")
+        cable_types.append(edge.cable_type)
 
-        result["node1_id"].append(edge.node1.node_id)
-        result["node1_x"].append(edge.node1.x)
-        result["node1_y"].append(edge.node1.y)
-
-        result["node2_id"].append(edge.node2.node_id)
-        result["node2_x"].append(edge.node2.x)
-        result["node2_y"].append(edge.node2.y)
-
-        result["cable_type"].append(edge.cable_type.name)
-        result["num_cables"].append(edge.num_cables)
-        result["max_power"].append(edge.num_cables * edge.cable_type.capacity)
-        result["flow"].append(edge.flow)
-        result["distance"].append(edge.get_dist())
-        result["cost"].append(edge.get_cost())
+    node1_coords = get_coords([edge.node1 for edge in edges])
+    node2_coords = get_coords([edge.node2 for edge in edges])
+    num_cables = np.array([edge.num_cables for edge in edges], dtype=int)
+    capacities = np.array([cable_type.capacity for cable_type in cable_types])
+    costs_per_meter = np.array(
+        [cable_type.cost_per_meter for cable_type in cable_types]
+    )
+    distances = np.sqrt(((node1_coords - node2_coords) ** 2).sum(axis=1))
 
-    df = pd.DataFrame(result)
-    df["node1_x"] = df["node1_x"].astype(float)
-    df["node1_y"] = df["node1_y"].astype(float)
-    df["node2_x"] = df["node2_x"].astype(float)
-    df["node2_y"] = df["node2_y"].astype(float)
+    df = pd.DataFrame(
+        {
+            "node1_id": [edge.node1.node_id for edge in edges],
+            "node1_x": node1_coords[:, 0],
+            "node1_y": node1_coords[:, 1],
+            "node2_id": [edge.node2.node_id for edge in edges],
+            "node2_x": node2_coords[:, 0],
+            "node2_y": node2_coords[:, 1],
+            "cable_type": [cable_type.name for cable_type in cable_types],
+            "num_cables": num_cables,
+            "max_power": num_cables * capacities,
+            "flow": np.array([edge.flow for edge in edges], dtype=np.float64),
+            "distance": distances,
+            "cost": num_cables * costs_per_meter * distances,
+        }
+    )
     df_sorted = df.sort_values(by=["node1_id", "node2_id"])
     return df_sorted
 
 
-if __name__ == "__main__":
-    cur_path = pathlib.Path(".")
-    fig, axs = plt.subplots(2, 2, figsize=(10, 10))
+def solve(
+    num_rows: int,
+    num_cols: int,
+    mv_cables: list[CableType],
+    hv_cables: list[CableType] | None,
+    transformers: list[TransformerType] | None,
+    turbine_dists_sq: np.ndarray,
+) -> tuple[np.ndarray, CCP, list[Edge], float]:
+    """
+    Optimize the CCP and design the collection network for one configuration.
+    Has no side effects besides logging; plotting and file output are left to the
+    caller. Returns turbine coordinates, CCP, network edges, and collection network cost.
+    """
+    logger.info(f"Solving problem for {num_rows} x {num_cols} turbines")
+    logger.info(
+        f"Available export cables: {mv_cables + hv_cables if hv_cables else mv_cables}"
+    )
+    turbine_layout, turbine_coords = generate_turbine_layout(num_rows, num_cols)
 
-    def solve(
-        num_rows: int,
-        num_cols: int,
-        mv_cables: list[CableType],
-        hv_cables: list[CableType] | None,
-        transformers: list[TransformerType] | None,
-        ax,
-    ) -> tuple[CCP, list[Edge]]:
-        logger.info(f"Solving problem for {num_rows} x {num_cols} turbines")
-        logger.info(
-            f"Available export cables: {mv_cables + hv_cables if hv_cables else mv_cables}"
-        )
-        turbine_layout = generate_turbine_layout(num_rows, num_cols)
+    ccp = optimize_ccp_on_ray(
+        turbine_layout,
+        mv_cables,
+        hv_cables,
+        transformers,
+        turbine_dists_sq=turbine_dists_sq,
+        turbine_coords=turbine_coords,
+    )
 
-        ccp = optimize_ccp_on_ray(
-            turbine_layout,
-            mv_cables,
-            hv_cables,
-            transformers,
-        )
+    mst_edges, total_cost = design_collection_network(
+        turbine_layout,
+        ccp,
+        mv_cables,
+        turbine_dists_sq=turbine_dists_sq,
+        turbine_coords=turbine_coords,
+    )
 
-        mst_edges, total_cost = design_collection_network(
-            turbine_layout, ccp, mv_cables
-        )
+    # Report final solution
+    logger.info(f"Number of mst_edges: {len(mst_edges)}")
+    logger.info(f"total_cost = ${total_cost:,.2f}")
 
-        # Plot turbines
-        ax.scatter(
-            [t.x for t in turbine_layout],
-            [t.y for t in turbine_layout],
-            c="b",
-            s=20,
-            label="Turbines",
-        )
+    return turbine_coords, ccp, mst_edges, total_cost
 
-        # Plot CCP
-        ax.scatter(
-            [ccp.x],
-            [ccp.y],
-            c="red",
-            marker="*",
-            s=80,
-            label="Optimized CCP",
-            zorder=5,
-        )
 
-        # Plot connections (edges)
-        for edge in mst_edges:
-            x_coords = [edge.node1.x, edge.node2.x]
-            y_coords = [edge.node1.y, edge.node2.y]
+def plot_solution(
+    ax,
+    title: str,
+    turbine_coords: np.ndarray,
+    ccp: CCP,
+    mst_edges: list[Edge],
+) -> None:
+    # Plot turbines
+    ax.scatter(
+        turbine_coords[:, 0],
+        turbine_coords[:, 1],
+        c="b",
+        s=20,
+        label="Turbines",
+    )
 
-            if edge.cable_type:
-                color = "red"
-                if edge.cable_type.name == "mv1":
-                    color = "green"
-                elif edge.cable_type.name == "mv2":
-                    color = "orange"
-                else:
-                    raise ValueError(
-                        f"Turbine-turbine and CCP-turbine connections can only be MV, found {edge.cable_type.name}"
-                    )
-                # Line width based on number of cables
-                linewidth = 0.5 + edge.num_cables * 0.3
-                ax.plot(
-                    x_coords,
-                    y_coords,
-                    color=color,
-                    linewidth=linewidth,
-                    alpha=0.6,
-                )
+    # Plot CCP
+    ax.scatter(
+        [ccp.x],
+        [ccp.y],
+        c="red",
+        marker="*",
+        s=80,
+        label="Optimized CCP",
+        zorder=5,
+    )
+
+    # Plot connections (edges), drawn as one collection
+    segments = []
+    colors = []
+    linewidths = []
+    for edge in mst_edges:
+        if edge.cable_type:
+            color = "red"
+            if edge.cable_type.name == "mv1":
+                color = "green"
+            elif edge.cable_type.name == "mv2":
+                color = "orange"
             else:
-                raise ValueError("Found edge with undetermined cable type")
+                raise ValueError(
+                    f"Turbine-turbine and CCP-turbine connections can only be MV, found {edge.cable_type.name}"
+                )
+            segments.append(
+                [(edge.node1.x, edge.node1.y), (edge.node2.x, edge.node2.y)]
+            )
+            colors.append(color)
+            # Line width based on number of cables
+            linewidths.append(0.5 + edge.num_cables * 0.3)
+        else:
+            raise ValueError("Found edge with undetermined cable type")
+    ax.add_collection(
+        LineCollection(
+            segments,
+            colors=colors,
+            linewidths=linewidths,
+            alpha=0.6,
+            capstyle="projecting",
+        )
+    )
 
-        # Report final solution
-        logger.info(f"Number of mst_edges: {len(mst_edges)}")
-        logger.info(f"total_cost = ${total_cost:,.2f}")
+    coords_min, coords_max = turbine_coords.min(axis=0), turbine_coords.max(axis=0)
+    ax.set_xlim([coords_min[0] - 500, coords_max[0] + 500])
+    ax.set_ylim([coords_min[1] - 250, coords_max[1] + 250])
+    ax.set_title(title)
+    ax.set_aspect("equal")
+    ax.grid(alpha=0.3)
+    ax.legend()
 
-        hv_availability_str = "available" if hv_cables else "unavailable"
-        ax.set_xlim(
-            [
-                min([turbine.x for turbine in turbine_layout]) - 500,
-                max([turbine.x for turbine in turbine_layout]) + 500,
-            ]
-        )
-        ax.set_ylim(
-            [
-                min([turbine.y for turbine in turbine_layout]) - 250,
-                max([turbine.y for turbine in turbine_layout]) + 250,
-            ]
-        )
-        ax.set_title(
-            f"{num_rows} x {num_cols}, cost=${total_cost:,.0f}, HV {hv_availability_str}"
-        )
-        ax.set_aspect("equal")
-        ax.grid(alpha=0.3)
-        ax.legend()
 
-        return ccp, mst_edges
+if __name__ == "__main__":
+    cur_path = pathlib.Path(".")
+    fig, axs = plt.subplots(2, 2, figsize=(10, 10))
 
     mv_cable_options = [CableType("mv1", 58.29, 1110), CableType("mv2", 90.87, 1515)]
     hv_cable_options = [CableType("hv1", 404.67, 1926), CableType("hv2", 490.41, 2475)]
@@ -186,65 +207,48 @@ if __name__ == "__main__":
     ]
     collection_dfs: list[tuple[str, pd.DataFrame]] = []
 
-    # 1.1 HV available, 4 x 7
-    ccp, edges = solve(
-        4,
-        7,
-        mv_cable_options,
-        hv_cable_options,
-        hv_transformers,
-        axs[0][0],
-    )
-    collection_procurement_df = generate_collection_procurement(edges)
-    collection_dfs.append(("collection_4_7_hv", collection_procurement_df))
-    logger.info(
-        f"Results: CCP location = {(ccp.x, ccp.y)}, Transformer Usage = {ccp.transformer_usage}"
-    )
+    # (sheet_name, num_rows, num_cols, hv_cables, transformers, ax)
+    configs = [
+        # 1.1 HV available, 4 x 7
+        ("collection_4_7_hv", 4, 7, hv_cable_options, hv_transformers, axs[0][0]),
+        # 1.2 HV unavailable, 4 x 7
+        ("collection_4_7_no_hv", 4, 7, None, None, axs[0][1]),
+        # 2.1 HV available, 6 x 10
+        ("collection_6_10_hv", 6, 10, hv_cable_options, hv_transformers, axs[1][0]),
+        # 2.2 HV unavailable, 6 x 10
+        ("collection_6_10_no_hv", 6, 10, None, None, axs[1][1]),
+    ]
 
-    # 1.2 HV unavailable, 4 x 7
-    ccp, edges = solve(
-        4,
-        7,
-        mv_cable_options,
-        None,
-        None,
-        axs[0][1],
-    )
-    collection_procurement_df = generate_collection_procurement(edges)
-    collection_dfs.append(("collection_4_7_no_hv", collection_procurement_df))
-    logger.info(
-        f"Results: CCP location = {(ccp.x, ccp.y)}, Transformer Usage = {ccp.transformer_usage}"
-    )
+    # Each layout is solved with and without HV, so compute its turbine distances once
+    turbine_dists_sq = {}
+    for layout_shape in [(4, 7), (6, 10)]:
+        _, coords = generate_turbine_layout(*layout_shape)
+        turbine_dists_sq[layout_shape] = pairwise_dist_sq(coords)
 
-    # 2.1 HV available, 6 x 10
-    ccp, edges = solve(
-        6,
-        10,
-        mv_cable_options,
-        hv_cable_options,
-        hv_transformers,
-        axs[1][0],
-    )
-    collection_procurement_df = generate_collection_procurement(edges)
-    collection_dfs.append(("collection_6_10_hv", collection_procurement_df))
-    logger.info(
-        f"Results: CCP location = {(ccp.x, ccp.y)}, Transformer Usage = {ccp.transformer_usage}"
-    )
+    for sheet_name, num_rows, num_cols, hv_cables, transformers, ax in configs:
+        turbine_coords, ccp, edges, total_cost = solve(
+            num_rows,
+            num_cols,
+            mv_cable_options,
+            hv_cables,
+            transformers,
+            turbine_dists_sq[(num_rows, num_cols)],
+        )
 
-    # 2.2 HV unavailable, 6 x 10
-    ccp, edges = solve(
-        6,
-        10,
-        mv_cable_options,
-        None,
-        None,
-        axs[1][1],
-    )
-    collection_procurement_df = generate_collection_procurement(edges)
-    collection_dfs.append(("collection_6_10_no_hv", collection_procurement_df))
-    logger.info(
-        f"Results: CCP location = {(ccp.x, ccp.y)}, Transformer Usage = {ccp.transformer_usage}"
-    )
+        hv_availability_str = "available" if hv_cables else "unavailable"
+        plot_solution(
+            ax,
+            f"{num_rows} x {num_cols}, cost=${total_cost:,.0f}, HV {hv_availability_str}",
+            turbine_coords,
+            ccp,
+            edges,
+        )
+
+        collection_procurement_df = generate_collection_procurement(edges)
+        collection_dfs.append((sheet_name, collection_procurement_df))
+        logger.info(
+            f"Results: CCP location = {(ccp.x, ccp.y)}, Transformer Usage = {ccp.transformer_usage}"
+        )
 
     # Write procurement to file
     excel_path = cur_path / "collection_procurement_results.xlsx"
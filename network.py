@@ -1,36 +1,50 @@
-from config import Node, Edge, CableType, get_dist
+from config import Node, Edge, CableType
+import functools
 import math
+import numpy as np
 
 
 class Turbine(Node):
+    # Node is slotted, so subclasses declare theirs to stay free of a __dict__
+    __slots__ = ("neighbors", "neighbor_nodes", "connected")
+
     def __init__(self, node_id: int, x: float, y: float) -> None:
         super().__init__(node_id, x, y)
-        self.neighbors: list[Node] = []
+        self.neighbors: set[int] = set()  # node ids, for O(1) membership tests
+        self.neighbor_nodes: list[Node] = []  # same nodes, in insertion order
         self.connected: list[Node] = []
 
     def add_neighbor(self, neighbor_node: Node) -> None:
-        self.neighbors.append(neighbor_node)
+        if neighbor_node.node_id not in self.neighbors:
+            self.neighbors.add(neighbor_node.node_id)
+            self.neighbor_nodes.append(neighbor_node)
 
     def add_neighbors(self, neighbors: list[Node]) -> None:
-        self.neighbors.extend(neighbors)
+        for neighbor_node in neighbors:
+            self.add_neighbor(neighbor_node)
 
     def get_neighbors(self) -> list[Node]:
-        return self.neighbors.copy()  # shallow
+        return self.neighbor_nodes.copy()  # shallow
 
     def get_connected(self) -> list[Node]:
         return self.connected.copy()  # shallow
 
 
 class CCP(Node):
+    __slots__ = ("connected_turbines", "_connected_ids", "transformer_usage")
+
     def __init__(
         self, node_id: int, x: float, y: float, transformer_usage: dict[str, int] | None
     ) -> None:
         super().__init__(node_id, x, y)
         self.connected_turbines: list[Turbine] = []
+        self._connected_ids: set[int] = set()
         self.transformer_usage: dict[str, int] | None = transformer_usage
 
     def connect_to_turbine(self, turbine: Turbine) -> None:
-        self.connected_turbines.append(turbine)
+        if turbine.node_id not in self._connected_ids:
+            self._connected_ids.add(turbine.node_id)
+            self.connected_turbines.append(turbine)
         turbine.add_neighbor(self)
 
     def connect_to_turbines(self, turbines: list[Turbine]) -> None:
@@ -41,75 +55,83 @@ class CCP(Node):
         return self.connected_turbines.copy()  # shallow
 
 
-def build_rooted_mst(
-    nodes: list[Node],
-) -> tuple[list[Edge], dict[int, list[tuple[Node, Edge]]]]:
+# Functions taking turbine_coords or turbine_dists_sq expect get_coords(turbines) and
+# pairwise_dist_sq of it. Neither depends on the CCP, so callers compute them once per
+# layout; where the parameters are optional they are computed if not given.
+def get_coords(nodes: list[Node]) -> np.ndarray:
     """
-    Build MST rooted at nodes[0] (which should be the CCP) using Prim's algorithm.
-    Returns a list of MST edges and the rooted tree structure.
+    V x 2 array with one (x, y) row per node.
     """
-    if len(nodes) <= 1:
-        return [], {}
-
-    root = nodes[0]
-    in_mst: set[int] = {root.node_id}
-    mst_edges: list[Edge] = []
-
-    # Tree structure: parent_id -> [(child, edge), ...]
-    tree: dict[int, list[tuple[Node, Edge]]] = {root.node_id: []}
+    return np.array([(node.x, node.y) for node in nodes], dtype=np.float64).reshape(
+        -1, 2
+    )
 
-    while len(in_mst) < len(nodes):
-        min_edge = None
-        min_distance = float("inf")
-        parent_node = Node(-1, -1, -1)  # dummy node at the start
-        for node in nodes:
-            if node.node_id in in_mst:
-                for other_node in nodes:
-                    if other_node.node_id not in in_mst:
-                        dist = get_dist(node, other_node)
-                        if dist < min_distance:
-                            min_distance = dist
-                            min_edge = Edge(node, other_node)
-                            parent_node = node
 
-        if min_edge:
-            mst_edges.append(min_edge)
-            in_mst.add(min_edge.node2.node_id)
-
-            # Add child to tree
-            if parent_node.node_id not in tree:
-                tree[parent_node.node_id] = []
-            tree[parent_node.node_id].append((min_edge.node2, min_edge))
-            # tree[min_edge.node2.node_id] = []
-
-    return mst_edges, tree
-
-
-def calculate_flows(
-    tree: dict[int, list[tuple[Node, Edge]]], ccp: CCP, turbine_power: float = 12.0
-) -> dict[tuple[int, int], float]:
+def pairwise_dist_sq(coords: np.ndarray) -> np.ndarray:
     """
-    Calculate power flow on each edge using DFS.
-    Returns dict mapping (node1_id, node2_id) -> flow
+    V x V matrix of squared Euclidean distances between the rows of a V x 2 coordinate
+    array, computed in one broadcast pass.
     """
-    flows: dict[tuple[int, int], float] = {}
-
-    def dfs(node: Node) -> float:
-        total_power = 0.0
-        if isinstance(node, Turbine):
-            total_power = turbine_power
+    diff = coords[:, None, :] - coords[None, :, :]
+    return diff[..., 0] ** 2 + diff[..., 1] ** 2
 
-        if node.node_id in tree:
-            for child, edge in tree[node.node_id]:
-                child_power = dfs(child)
-                edge_key = (edge.node1.node_id, edge.node2.node_id)
-                flows[edge_key] = child_power
-                total_power += child_power
 
-        return total_power
-
-    dfs(ccp)
-    return flows
+def prim_mst(
+    root_dists: np.ndarray, dists: np.ndarray
+) -> tuple[list[int], np.ndarray, np.ndarray]:
+    """
+    Prim's algorithm on a complete graph of V nodes plus a root, where root_dists[i] is
+    the distance from the root to node i and dists is the V x V distance matrix.
+    Returns the order in which nodes join the MST, parent[] (-1 for the root), and
+    key[], the distance from each node to its parent.
+
+    Distances are only compared, so callers pass squared distances and take the square
+    root of key[] afterwards; no sqrt is needed while building the tree.
+
+    Each node keeps the distance to its closest in-MST node in key[] together with
+    that node in parent[], so every iteration is a single vectorized O(V) update.
+    Equal distances are resolved by lowest (parent, node) index, the order in which a
+    scan over all (in-MST node, other node) pairs would find them. Turbine grids have
+    many ties, and the choice changes flows and therefore cable costs.
+    """
+    num_nodes = len(root_dists)
+    key = root_dists.astype(np.float64)  # the root is in the MST from the start
+    parent = np.full(num_nodes, -1, dtype=int)
+    in_mst = np.zeros(num_nodes, dtype=bool)
+
+    order: list[int] = []
+    for _ in range(num_nodes):
+        candidate_keys = np.where(in_mst, np.inf, key)
+        u = int(np.argmin(candidate_keys))
+        ties = np.flatnonzero(candidate_keys == candidate_keys[u])
+        if len(ties) > 1:
+            u = int(ties[np.argmin(parent[ties])])
+        in_mst[u] = True
+        order.append(u)
+
+        dist = dists[u]
+        closer = ~in_mst & ((dist < key) | ((dist == key) & (u < parent)))
+        key[closer] = dist[closer]
+        parent[closer] = u
+
+    return order, parent, key
+
+
+def accumulate_flows(
+    order: list[int], parent: np.ndarray, turbine_power: float = 12.0
+) -> np.ndarray:
+    """
+    Power each turbine sends towards the root, i.e. everything generated in its
+    subtree, for a tree given by parent[] (-1 for the root) and the order in which
+    nodes were attached. Children are attached after their parents, so walking that
+    order backwards is a post-order traversal.
+    """
+    parents = parent.tolist()
+    flows = [turbine_power] * len(parents)
+    for u in reversed(order):
+        if parents[u] >= 0:
+            flows[parents[u]] += flows[u]
+    return np.array(flows, dtype=np.float64)
 
 
 def select_cable_bundle(
@@ -119,6 +141,17 @@ def select_cable_bundle(
     Select the most cost-effective cable bundle for required flow.
     Returns (cable_type, number_of_cables).
     """
+    return cached_cable_bundle(required_flow, tuple(cable_options))
+
+
+@functools.lru_cache(maxsize=128)
+def cached_cable_bundle(
+    required_flow: float, cable_options: tuple[CableType, ...]
+) -> tuple[CableType, int]:
+    """
+    select_cable_bundle memoized on the flow and catalog; CableType is frozen, so
+    a tuple of them is hashable.
+    """
     best_option = ((CableType("DummyCable", 0.0, float("inf"))), 0)
     best_cost_per_meter = float("inf")
 
@@ -132,41 +165,54 @@ def select_cable_bundle(
     return best_option
 
 
+def select_cable_bundles(
+    required_flows: np.ndarray, cable_options: list[CableType]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized select_cable_bundle over an array of flows.
+    Returns (index into cable_options, number_of_cables) arrays, one entry per flow.
+    """
+    capacities = np.array([cable_type.capacity for cable_type in cable_options])
+    costs_per_meter = np.array(
+        [cable_type.cost_per_meter for cable_type in cable_options]
+    )
+    num_needed = np.ceil(required_flows[:, None] / capacities)
+    cable_idx = np.argmin(num_needed * costs_per_meter, axis=1)
+    num_cables = num_needed[np.arange(len(required_flows)), cable_idx]
+    return cable_idx, num_cables.astype(int)
+
+
+def bundle_cost_table(
+    num_turbines: int, cable_options: list[CableType], turbine_power: float = 12.0
+) -> np.ndarray:
+    """
+    Cost per meter of the cheapest cable bundle for an edge carrying the power of
+    k = 0..num_turbines turbines. Every edge in the collection network carries a whole
+    number of turbines' output, so this replaces select_cable_bundle with a lookup.
+    """
+    flows = turbine_power * np.arange(num_turbines + 1)
+    cable_idx, num_cables = select_cable_bundles(flows, cable_options)
+    costs_per_meter = np.array(
+        [cable_type.cost_per_meter for cable_type in cable_options]
+    )
+    return num_cables * costs_per_meter[cable_idx]
+
+
 def update_node_connections(edges: list[Edge], ccp: CCP) -> None:
     """
     Update the Node objects to reflect determined connections.
     """
-    connections: dict[int, set[int]] = {}
-    for edge in edges:
-        if edge.node1.node_id not in connections:
-            connections[edge.node1.node_id] = set()
-        if edge.node2.node_id not in connections:
-            connections[edge.node2.node_id] = set()
-        connections[edge.node1.node_id].add(edge.node2.node_id)
-        connections[edge.node2.node_id].add(edge.node1.node_id)
-
-    edge_map = {}
-    for edge in edges:
-        edge_map[(edge.node1.node_id, edge.node2.node_id)] = edge
-        edge_map[(edge.node2.node_id, edge.node1.node_id)] = edge
-
     for edge in edges:
         # Update neighbors
-        if isinstance(edge.node1, Turbine) and edge.node1.node_id not in [
-            n.node_id for n in edge.node1.neighbors
-        ]:
+        if isinstance(edge.node1, Turbine):
             edge.node1.add_neighbor(edge.node2)
-        if isinstance(edge.node2, Turbine) and edge.node2.node_id not in [
-            n.node_id for n in edge.node2.neighbors
-        ]:
+        if isinstance(edge.node2, Turbine):
             edge.node2.add_neighbor(edge.node1)
 
         if isinstance(edge.node1, CCP) and isinstance(edge.node2, Turbine):
-            if edge.node2 not in ccp.connected_turbines:
-                ccp.connected_turbines.append(edge.node2)
+            ccp.connect_to_turbine(edge.node2)
         elif isinstance(edge.node2, CCP) and isinstance(edge.node1, Turbine):
-            if edge.node1 not in ccp.connected_turbines:
-                ccp.connected_turbines.append(edge.node1)
+            ccp.connect_to_turbine(edge.node1)
 
 
 def design_collection_network(
@@ -174,31 +220,67 @@ def design_collection_network(
     ccp: CCP,
     cable_options: list[CableType],
     turbine_power: float = 12.0,
+    turbine_dists_sq: np.ndarray | None = None,
+    turbine_coords: np.ndarray | None = None,
 ) -> tuple[list[Edge], float]:
     """
     Design collection network using capacity-aware MST algorithm.
     """
+    coords = get_coords(turbines) if turbine_coords is None else turbine_coords
+    if turbine_dists_sq is None:
+        turbine_dists_sq = pairwise_dist_sq(coords)
+
     # Step 1: Build MST with CCP as root
-    all_nodes = [ccp] + turbines  # CCP must be first node
-    mst_edges, tree = build_rooted_mst(all_nodes)  # type: ignore
+    ccp_dists_sq = (coords[:, 0] - ccp.x) ** 2 + (coords[:, 1] - ccp.y) ** 2
+    order, parent, lengths_sq = prim_mst(ccp_dists_sq, turbine_dists_sq)
+    lengths = np.sqrt(lengths_sq)
 
     # Step 2: Calculate flow on each edge
-    flows = calculate_flows(tree, ccp, turbine_power)
+    flows = accumulate_flows(order, parent, turbine_power)
 
     # Step 3: Assign cable types based on flow
-    for edge in mst_edges:
-        edge_key = (edge.node1.node_id, edge.node2.node_id)
-        if edge_key in flows:
-            flow = flows[edge_key]
-            cable_type, num_cables = select_cable_bundle(flow, cable_options)
-            edge.flow = flow
-            edge.cable_type = cable_type
-            edge.num_cables = num_cables
-
-    # Step 4: Update node connections
-    update_node_connections(mst_edges, ccp)
+    cable_idx, num_cables = select_cable_bundles(flows, cable_options)
+
+    # Step 4: Calculate total cost in one pass over all edges
+    costs_per_meter = np.array(
+        [cable_type.cost_per_meter for cable_type in cable_options]
+    )
+    total_cost = float(np.sum(num_cables * costs_per_meter[cable_idx] * lengths))
 
-    # Step 5: Calculate total cost
-    total_cost = sum(edge.get_cost() for edge in mst_edges)
+    # Step 5: Create the edges and update node connections
+    mst_edges: list[Edge] = []
+    for u in order:
+        parent_node = ccp if parent[u] < 0 else turbines[parent[u]]
+        mst_edges.append(
+            Edge(
+                parent_node,
+                turbines[u],
+                float(flows[u]),
+                cable_options[cable_idx[u]],
+                int(num_cables[u]),
+            )
+        )
+    update_node_connections(mst_edges, ccp)
 
     return mst_edges, total_cost
+
+
+def collection_cost(
+    turbine_xs: np.ndarray,
+    turbine_ys: np.ndarray,
+    turbine_dists_sq: np.ndarray,
+    ccp_x: float,
+    ccp_y: float,
+    bundle_cost_per_meter: np.ndarray,
+) -> float:
+    """
+    Cost of the network design_collection_network would build for a CCP at
+    (ccp_x, ccp_y). Works on coordinate arrays only and never creates Node/Edge objects,
+    so it is cheap enough to call for every candidate CCP during the search.
+    bundle_cost_per_meter is the bundle_cost_table, which does not depend on the CCP
+    either.
+    """
+    ccp_dists_sq = (turbine_xs - ccp_x) ** 2 + (turbine_ys - ccp_y) ** 2
+    order, parent, lengths_sq = prim_mst(ccp_dists_sq, turbine_dists_sq)
+    num_downstream = accumulate_flows(order, parent, 1.0).astype(int)
+    return float(np.sum(bundle_cost_per_meter[num_downstream] * np.sqrt(lengths_sq)))
@@ -1,160 +1,392 @@
-from config import Node, CableType, TransformerType, get_dist
-from network import CCP, Turbine, select_cable_bundle, design_collection_network
+from config import Node, CableType, TransformerType, ExportRates, get_dist
+from network import (
+    CCP,
+    Turbine,
+    select_cable_bundle,
+    bundle_cost_table,
+    collection_cost,
+    get_coords,
+    pairwise_dist_sq,
+)
+from collections import defaultdict
+import functools
+import itertools
 import math
-import statistics
+import numpy as np
 
+# Catalogs with at most this many transformer types are solved by enumeration
+MAX_ENUMERATED_TRANSFORMER_TYPES = 2
 
-def compute_export_cost(
-    ccp: CCP,
-    onshore: Node,
+# The knapsack DP works on integer costs, rounded to 1 / TRANSFORMER_COST_SCALE (cents)
+TRANSFORMER_COST_SCALE = 100
+INT_INF = 10**18
+
+# Below this rated power (in DP units) a NumPy block update covers too few states to
+# beat a scalar pass over the states
+MIN_BLOCK_POWER = 10
+
+# (max_power, catalog) -> (transformer_cost, transformer_usage)
+transformer_cache: dict[
+    tuple[int, tuple[tuple[str, int, float], ...]], tuple[float, dict[str, int] | None]
+] = {}
+
+
+def enumerate_transformers(
+    max_power: int, transformers: list[TransformerType]
+) -> tuple[float, dict[str, int] | None]:
+    """
+    Cheapest transformer combination with combined rated power >= max_power, found by
+    trying every count of all but the last type; the last type covers whatever is left.
+    Types rated below 1 MW are skipped and costs are compared in whole cents, as in
+    the knapsack DP, so both return the same cost.
+    """
+    transformers = [tr for tr in transformers if int(tr.rated_power) > 0]
+    if not transformers:
+        return (0.0, {}) if max_power <= 0 else (float("inf"), None)
+
+    *others, last = transformers
+    count_ranges = [
+        range(math.ceil(max_power / int(tr.rated_power)) + 1) for tr in others
+    ]
+    int_costs = [round(tr.cost * TRANSFORMER_COST_SCALE) for tr in transformers]
+    *other_int_costs, last_int_cost = int_costs
+
+    best_cost = INT_INF
+    best_counts: tuple[int, ...] | None = None
+    for counts in itertools.product(*count_ranges):
+        power = sum(n * int(tr.rated_power) for n, tr in zip(counts, others))
+        num_last = max(0, math.ceil((max_power - power) / int(last.rated_power)))
+        cost = (
+            sum(n * c for n, c in zip(counts, other_int_costs))
+            + num_last * last_int_cost
+        )
+        if cost < best_cost:
+            best_cost = cost
+            best_counts = counts + (num_last,)
+
+    if best_counts is None:
+        return float("inf"), None
+
+    transformer_usage: defaultdict[str, int] = defaultdict(int)
+    for n, tr in zip(best_counts, transformers):
+        if n > 0:
+            transformer_usage[tr.name] += n
+    return best_cost / TRANSFORMER_COST_SCALE, dict(transformer_usage)
+
+
+def transformers_to_arrays(
+    transformers: list[TransformerType],
+) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """
+    Transformer catalog as parallel arrays of rated powers (int32) and costs, plus
+    the names in the same order.
+    """
+    powers = np.array([int(tr.rated_power) for tr in transformers], dtype=np.int32)
+    costs = np.array([tr.cost for tr in transformers], dtype=np.float64)
+    names = [tr.name for tr in transformers]
+    return powers, costs, names
+
+
+def solve_transformer_knapsack(
+    powers: np.ndarray, costs: np.ndarray, max_power: int
+) -> tuple[float, np.ndarray]:
+    """
+    Unbounded knapsack DP over transformer rated powers and costs.
+    Returns the minimum cost to reach >= max_power (inf if infeasible) and the parent
+    array: parent[p] is the index of the last transformer added to reach >= p.
+    """
+    int_costs = np.round(costs * TRANSFORMER_COST_SCALE).astype(np.int64)
+
+    # dp[p] = minimum transformer cost in cents to reach >= p power. The last
+    # transformer added is parent[p], so the rest has to reach >= p - its power.
+    dp = np.full(max_power + 1, INT_INF, dtype=np.int64)
+    parent = np.full(max_power + 1, -1, dtype=np.int32)
+    dp[0] = 0
+    for idx in range(len(powers)):
+        tr_power, tr_cost = int(powers[idx]), int_costs[idx]
+        if tr_power <= 0:  # never gets any closer to max_power
+            continue
+        if tr_power < MIN_BLOCK_POWER:
+            # Same pull update one state at a time, on Python ints
+            dp_list, parent_list = dp.tolist(), parent.tolist()
+            tr_cost = int(tr_cost)
+            for p in range(1, max_power + 1):
+                cost = dp_list[max(0, p - tr_power)] + tr_cost
+                if cost < dp_list[p]:
+                    dp_list[p] = cost
+                    parent_list[p] = idx
+            dp[:], parent[:] = dp_list, parent_list
+            continue
+        # States below tr_power are reached by this transformer alone
+        first_block = dp[1:tr_power]
+        better = tr_cost < first_block
+        first_block[better] = tr_cost
+        parent[1:tr_power][better] = idx
+        # Each later block of tr_power states pulls from the block before it, already
+        # updated for this transformer, so it can be used any number of times
+        for block_start in range(tr_power, max_power + 1, tr_power):
+            block_stop = min(block_start + tr_power, max_power + 1)
+            cost = dp[block_start - tr_power : block_stop - tr_power] + tr_cost
+            better = cost < dp[block_start:block_stop]
+            dp[block_start:block_stop][better] = cost[better]
+            parent[block_start:block_stop][better] = idx
+
+    if dp[max_power] == INT_INF:
+        return float("inf"), parent
+    return int(dp[max_power]) / TRANSFORMER_COST_SCALE, parent
+
+
+def knapsack_transformers(
+    max_power: int, transformers: list[TransformerType]
+) -> tuple[float, dict[str, int] | None]:
+    """
+    Cheapest transformer combination with combined rated power >= max_power, found by
+    unbounded knapsack DP. Works for catalogs of any size.
+    """
+    powers, costs, names = transformers_to_arrays(transformers)
+
+    # Any combination's power is a multiple of the rated powers' GCD, so reaching
+    # >= max_power means reaching >= ceil(max_power / gcd) in units of the GCD
+    power_unit = int(np.gcd.reduce(powers)) or 1
+    powers = powers // power_unit
+    max_units = math.ceil(max_power / power_unit)
+
+    transformer_cost, parent = solve_transformer_knapsack(powers, costs, max_units)
+    if transformer_cost == float("inf"):
+        return transformer_cost, None
+
+    # DP path reconstruction
+    transformer_usage: defaultdict[str, int] = defaultdict(int)
+    cur_power = max_units
+    while cur_power > 0:
+        idx = parent[cur_power]
+        transformer_usage[names[idx]] += 1
+        cur_power = max(0, cur_power - int(powers[idx]))
+
+    return transformer_cost, dict(transformer_usage)
+
+
+def select_transformers(
+    total_power: float, transformers: list[TransformerType]
+) -> tuple[float, dict[str, int] | None]:
+    """
+    Cheapest transformer combination with combined rated power >= total_power.
+    Returns the total transformer cost and the number used per type, or (inf, None)
+    if no combination is feasible. Results are cached per power and catalog since the
+    search evaluates the same farm many times.
+    """
+    max_power = int(math.ceil(total_power))
+    catalog = tuple((tr.name, int(tr.rated_power), tr.cost) for tr in transformers)
+    key = (max_power, catalog)
+    if key not in transformer_cache:
+        num_types = sum(1 for tr in transformers if int(tr.rated_power) > 0)
+        if 0 < num_types <= MAX_ENUMERATED_TRANSFORMER_TYPES:
+            transformer_cache[key] = enumerate_transformers(max_power, transformers)
+        else:
+            transformer_cache[key] = knapsack_transformers(max_power, transformers)
+
+    transformer_cost, transformer_usage = transformer_cache[key]
+    if transformer_usage is None:
+        return transformer_cost, None
+    return transformer_cost, dict(transformer_usage)  # callers may modify it
+
+
+def transformer_cost_lower_bound(
+    total_power: float, transformers: list[TransformerType]
+) -> float:
+    """
+    Lower bound on the cost of any transformer combination carrying total_power:
+    the lowest cost per MW of rated power times total_power, inf if no type is usable.
+    """
+    min_cost_per_power = min(
+        (
+            tr.cost / int(tr.rated_power)
+            for tr in transformers
+            if int(tr.rated_power) > 0
+        ),
+        default=float("inf"),
+    )
+    return min_cost_per_power * total_power
+
+
+def compute_export_rates(
     total_power: float,
     mv_cables: list[CableType],
     hv_cables: list[CableType] | None,
     transformers: list[TransformerType] | None,
-) -> tuple[float, dict[str, int] | None]:
+    max_dist: float | None = None,
+) -> ExportRates:
     """
-    Compute export system cost from CCP to onshore.
-      - MV-only export
-      - HV export with any number of transformers (unbounded)
-    Returns the minimum feasible cost.
+    Cable bundle and transformer selection for the export system, which only depend
+    on total_power and not on the CCP location. Export cost at distance d is then
+    min(mv_cost_per_meter * d, hv_cost_per_meter * d + transformer_cost).
+    If max_dist is given and MV beats the HV lower bound at every distance up to it,
+    transformers are not sized and the rates are returned as MV-only.
     """
-    dist = get_dist(ccp, onshore)
-
-    # MV-only export
     mv_cable, mv_num = select_cable_bundle(total_power, mv_cables)
-    mv_cost = mv_num * mv_cable.cost_per_meter * dist
+    mv_cost_per_meter = mv_num * mv_cable.cost_per_meter
 
     # If HV not available, MV is the only option
     if hv_cables is None or transformers is None:
-        return mv_cost, None
+        return ExportRates(mv_cost_per_meter, float("inf"), float("inf"), None)
 
-    # HV cable cost
     hv_cable, hv_num = select_cable_bundle(total_power, hv_cables)
-    hv_cable_cost = hv_num * hv_cable.cost_per_meter * dist
+    hv_cost_per_meter = hv_num * hv_cable.cost_per_meter
 
-    # Transformer sizing (using knapsack DP)
-    max_power = int(math.ceil(total_power))
-    INF = float("inf")
+    # MV cost minus the HV lower bound is linear in d and negative at d = 0, so if MV
+    # wins at max_dist it wins at every shorter distance too
+    if max_dist is not None and mv_cost_per_meter * max_dist <= (
+        hv_cost_per_meter * max_dist
+        + transformer_cost_lower_bound(total_power, transformers)
+    ):
+        return ExportRates(mv_cost_per_meter, float("inf"), float("inf"), None)
 
-    # dp[p] = minimum transformer cost to reach >= p power
-    dp = [INF] * (max_power + 1)
-    dp[0] = 0.0
-    for p in range(max_power + 1):
-        if dp[p] == INF:
-            continue
-        for tr in transformers:
-            next_p = min(max_power, p + int(tr.rated_power))
-            dp[next_p] = min(dp[next_p], dp[p] + tr.cost)
+    transformer_cost, transformer_usage = select_transformers(total_power, transformers)
+    return ExportRates(
+        mv_cost_per_meter,
+        hv_cost_per_meter,
+        transformer_cost,
+        None if transformer_usage is None else tuple(transformer_usage.items()),
+    )
 
-    transformer_cost = dp[max_power]
-    if transformer_cost == INF:
+
+def export_cost_at_dist(
+    export_rates: ExportRates, dist: float
+) -> tuple[float, dict[str, int] | None]:
+    """
+    Export system cost over dist meters, MV or HV whichever is cheaper, along with
+    the transformer usage as a new dict (None if MV is used).
+    """
+    mv_cost = export_rates.mv_cost_per_meter * dist
+    if export_rates.transformer_usage is None:
         return mv_cost, None
 
-    # DP path reconstruction
-    transformer_usage: dict[str, int] = {}
-    cur_power = max_power
-    remaining_cost = transformer_cost
-    while cur_power > 0:
-        best_prev_power = -1
-        best_transformer = None
-        for tr in transformers:
-            tr_power = int(tr.rated_power)
-            prev_power = cur_power - tr_power
-            if prev_power < 0:
-                prev_power = 0
-
-            # If dp[prev_power] + tr.cost equals dp[current_power],
-            # this transformer could have been used
-            if prev_power <= cur_power and dp[prev_power] + tr.cost == remaining_cost:
-                best_prev_power = prev_power
-                best_transformer = tr
-                break
-
-        if best_transformer is None:
-            # If no exact match found, try to find the closest
-            for tr in transformers:
-                tr_power = int(tr.rated_power)
-                prev_power = cur_power - tr_power
-                if prev_power < 0:
-                    prev_power = 0
-
-                # Check if this step is feasible (cost-wise)
-                if (
-                    prev_power <= cur_power
-                    and dp[prev_power] + tr.cost <= remaining_cost + 1e-9
-                ):  # Allow floating point tolerance
-                    best_prev_power = prev_power
-                    best_transformer = tr
-                    break
-
-        if best_transformer is None:
-            raise RuntimeError(
-                "Unable to reconstruct path for best transformer combination"
-            )
-
-        # Record the transformer usage
-        tr_name = best_transformer.name
-        transformer_usage[tr_name] = transformer_usage.get(tr_name, 0) + 1
-
-        # Move to previous state
-        remaining_cost -= best_transformer.cost
-        cur_power = best_prev_power
-
-    # Return HV cost if it is better
-    hv_total_cost = hv_cable_cost + transformer_cost
-    if mv_cost <= hv_total_cost:
+    hv_cost = export_rates.hv_cost_per_meter * dist + export_rates.transformer_cost
+    if mv_cost <= hv_cost:
         return mv_cost, None
-    else:
-        return hv_total_cost, transformer_usage
+    return hv_cost, dict(export_rates.transformer_usage)
 
 
-def total_system_cost(
-    ccp_x: float,
-    ccp_y: float,
-    turbines: list[Turbine],
+def compute_export_cost(
+    ccp: CCP,
+    onshore: Node,
+    total_power: float,
     mv_cables: list[CableType],
     hv_cables: list[CableType] | None,
     transformers: list[TransformerType] | None,
-    turbine_power: float,
 ) -> tuple[float, dict[str, int] | None]:
     """
-    Stage 1 (collection) + Stage 2 (export) cost,
-    with CCP feasibility constraint.
+    Compute export system cost from CCP to onshore.
+      - MV-only export
+      - HV export with any number of transformers (unbounded)
+    Returns the minimum feasible cost.
     """
+    dist = get_dist(ccp, onshore)
+    export_rates = compute_export_rates(
+        total_power, mv_cables, hv_cables, transformers, max_dist=dist
+    )
+    return export_cost_at_dist(export_rates, dist)
 
-    def is_ccp_feasible(
-        ccp_x: float,
-        ccp_y: float,
-        turbines: list[Turbine],
-        min_dist: float = 250.0,
-    ) -> bool:
-        for t in turbines:
-            if math.hypot(ccp_x - t.x, ccp_y - t.y) < min_dist:
-                return False
-        return True
 
-    if not is_ccp_feasible(ccp_x, ccp_y, turbines):
-        return float("inf"), None
+def is_ccp_feasible(
+    ccp_x: float,
+    ccp_y: float,
+    turbine_xs: np.ndarray,
+    turbine_ys: np.ndarray,
+    min_dist: float = 250.0,
+) -> bool:
+    """
+    Whether a CCP at (ccp_x, ccp_y) is at least min_dist away from every turbine.
+    """
+    # Compare squared distances so no sqrt is needed
+    dx = turbine_xs - ccp_x
+    dy = turbine_ys - ccp_y
+    return bool(np.all(dx * dx + dy * dy >= min_dist * min_dist))
 
-    ccp = CCP(0, ccp_x, ccp_y, None)
+
+def total_system_cost(
+    ccp_x: float,
+    ccp_y: float,
+    turbine_xs: np.ndarray,
+    turbine_ys: np.ndarray,
+    turbine_dists_sq: np.ndarray,
+    bundle_cost_per_meter: np.ndarray,
+    export_rates: ExportRates,
+) -> tuple[float, dict[str, int] | None]:
+    """
+    Stage 1 (collection) + Stage 2 (export) cost,
+    with CCP feasibility constraint.
+    """
+    if not is_ccp_feasible(ccp_x, ccp_y, turbine_xs, turbine_ys):
+        return float("inf"), None
 
     # Stage 1: Collection
-    _, collection_cost = design_collection_network(
-        turbines, ccp, mv_cables, turbine_power
+    stage1_cost = collection_cost(
+        turbine_xs,
+        turbine_ys,
+        turbine_dists_sq,
+        ccp_x,
+        ccp_y,
+        bundle_cost_per_meter,
     )
 
-    # Stage 2: Export
-    onshore = Node(-1, 0.0, 0.0)
-    total_power = turbine_power * len(turbines)
-    export_cost, transformer_usage = compute_export_cost(
-        ccp,
-        onshore,
-        total_power,
-        mv_cables,
-        hv_cables,
-        transformers,
+    # Stage 2: Export to onshore at (0, 0)
+    stage2_cost, transformer_usage = export_cost_at_dist(
+        export_rates, math.hypot(ccp_x, ccp_y)
     )
-    return collection_cost + export_cost, transformer_usage
+    return stage1_cost + stage2_cost, transformer_usage
+
+
+def total_system_costs(
+    ccp_xs: np.ndarray,
+    ccp_ys: np.ndarray,
+    turbine_xs: np.ndarray,
+    turbine_ys: np.ndarray,
+    turbine_dists_sq: np.ndarray,
+    bundle_cost_per_meter: np.ndarray,
+    export_rates: ExportRates,
+    min_dist: float = 250.0,
+) -> np.ndarray:
+    """
+    total_system_cost for a batch of candidate CCPs at (ccp_xs[i], ccp_ys[i]), kept
+    as public API for callers scoring many candidates at once. ccp_xs and ccp_ys are
+    scalars or 1-D arrays of the same length. Returns the costs as a 1-D array, inf
+    for infeasible candidates.
+    """
+    ccp_xs = np.atleast_1d(np.asarray(ccp_xs, dtype=np.float64))
+    ccp_ys = np.atleast_1d(np.asarray(ccp_ys, dtype=np.float64))
+    if ccp_xs.ndim != 1 or ccp_xs.shape != ccp_ys.shape:
+        raise ValueError(
+            "ccp_xs and ccp_ys must be scalars or 1-D arrays of the same length, "
+            f"got shapes {ccp_xs.shape} and {ccp_ys.shape}"
+        )
+
+    # Feasibility, candidates x turbines
+    dx = turbine_xs[np.newaxis, :] - ccp_xs[:, np.newaxis]
+    dy = turbine_ys[np.newaxis, :] - ccp_ys[:, np.newaxis]
+    feasible = np.all(dx * dx + dy * dy >= min_dist * min_dist, axis=1)
+
+    # Stage 2: Export to onshore at (0, 0)
+    dists = np.hypot(ccp_xs, ccp_ys)
+    costs = export_rates.mv_cost_per_meter * dists
+    if export_rates.transformer_usage is not None:
+        hv_costs = (
+            export_rates.hv_cost_per_meter * dists + export_rates.transformer_cost
+        )
+        costs = np.minimum(costs, hv_costs)
+
+    # Stage 1: Collection, one MST per feasible candidate
+    costs[~feasible] = np.inf
+    for i in np.flatnonzero(feasible):
+        costs[i] += collection_cost(
+            turbine_xs,
+            turbine_ys,
+            turbine_dists_sq,
+            float(ccp_xs[i]),
+            float(ccp_ys[i]),
+            bundle_cost_per_meter,
+        )
+    return costs
 
 
 def optimize_ccp_on_ray(
@@ -163,45 +395,98 @@ def optimize_ccp_on_ray(
     hv_cables: list[CableType] | None,
     transformers: list[TransformerType] | None,
     turbine_power: float = 12.0,
+    turbine_dists_sq: np.ndarray | None = None,
+    turbine_coords: np.ndarray | None = None,
     tol: float = 1e-3,
+    rel_tol: float = 1e-6,
+    num_scan: int = 30,
 ) -> CCP:
     """
-    Ternary search along the ray from (0,0) to centroid.
+    Golden-section search along the ray from (0,0) to centroid. The cost along the ray
+    is not unimodal, so num_scan + 1 evenly spaced points are scanned first and the
+    search runs between the neighbors of the cheapest one. It stops once the interval
+    is narrower than tol, or once the two probe costs are within rel_tol of each other.
     """
-    cx = statistics.mean(t.x for t in turbines)
-    cy = statistics.mean(t.y for t in turbines)
+    if turbine_coords is None:
+        turbine_coords = get_coords(turbines)
+    turbine_xs, turbine_ys = turbine_coords[:, 0], turbine_coords[:, 1]
+    cx, cy = float(turbine_xs.mean()), float(turbine_ys.mean())
+    # Turbine-to-turbine distances are the same for every candidate CCP
+    if turbine_dists_sq is None:
+        turbine_dists_sq = pairwise_dist_sq(turbine_coords)
+    # So are the collection cable choices for a given flow
+    bundle_cost_per_meter = bundle_cost_table(len(turbines), mv_cables, turbine_power)
+    # And everything on the export side except the export distance. Rounding is
+    # monotone, so no probe is farther from onshore than the rounded centroid
+    export_rates = compute_export_rates(
+        turbine_power * len(turbines),
+        mv_cables,
+        hv_cables,
+        transformers,
+        max_dist=math.hypot(round(cx, 2), round(cy, 2)),
+    )
 
-    def cost_at(t: float) -> float:
+    # Probes are keyed to the centimeter, so the final CCP below is not re-evaluated
+    @functools.lru_cache(maxsize=256)
+    def cost_at_point(
+        ccp_x: float, ccp_y: float
+    ) -> tuple[float, dict[str, int] | None]:
         return total_system_cost(
-            t * cx,
-            t * cy,
-            turbines,
-            mv_cables,
-            hv_cables,
-            transformers,
-            turbine_power,
-        )[0]
-
-    lo, hi = 0.0, 1.0
-    while hi - lo > tol:
-        m1 = lo + (hi - lo) / 3
-        m2 = hi - (hi - lo) / 3
+            ccp_x,
+            ccp_y,
+            turbine_xs,
+            turbine_ys,
+            turbine_dists_sq,
+            bundle_cost_per_meter,
+            export_rates,
+        )
 
-        if cost_at(m1) < cost_at(m2):
-            hi = m2
-        else:
-            lo = m1
+    def probe_point(t: float) -> tuple[float, float]:
+        return round(t * cx, 2), round(t * cy, 2)
 
-    t_opt = 0.5 * (lo + hi)
+    def cost_at(t: float) -> float:
+        return cost_at_point(*probe_point(t))[0]
 
-    # Build final CCP
-    _, transformer_usage = total_system_cost(
-        t_opt * cx,
-        t_opt * cy,
-        turbines,
-        mv_cables,
-        hv_cables,
-        transformers,
-        turbine_power,
+    # Coarse scan to bracket the optimum. With HV the cost is a slowly rising MV
+    # plateau that drops once HV wins, which golden-section alone can step over.
+    scan_ts = np.linspace(0.0, 1.0, num_scan + 1)
+    scan_points = np.array([probe_point(t) for t in scan_ts])
+    scan_costs = total_system_costs(
+        scan_points[:, 0],
+        scan_points[:, 1],
+        turbine_xs,
+        turbine_ys,
+        turbine_dists_sq,
+        bundle_cost_per_meter,
+        export_rates,
     )
-    return CCP(0, t_opt * cx, t_opt * cy, transformer_usage)
+    best_scan = int(np.argmin(scan_costs))
+
+    # Golden-section search: the probe kept after narrowing is already at the golden
+    # ratio of the new interval, so each iteration costs one cost_at call
+    inv_phi = (math.sqrt(5) - 1) / 2
+    lo = float(scan_ts[max(best_scan - 1, 0)])
+    hi = float(scan_ts[min(best_scan + 1, num_scan)])
+    m1, m2 = hi - inv_phi * (hi - lo), lo + inv_phi * (hi - lo)
+    f1, f2 = cost_at(m1), cost_at(m2)
+    while hi - lo > tol:
+        if abs(f1 - f2) < rel_tol * min(f1, f2):
+            break  # cost is flat here, narrowing further barely changes it
+        if f1 < f2:
+            hi, m2, f2 = m2, m1, f1
+            m1 = hi - inv_phi * (hi - lo)
+            f1 = cost_at(m1)
+        else:
+            lo, m1, f1 = m1, m2, f2
+            m2 = lo + inv_phi * (hi - lo)
+            f2 = cost_at(m2)
+
+    # Keep the best of the two final probes and the scan point, whose costs are known
+    t_opt = m1 if f1 < f2 else m2
+    if scan_costs[best_scan] < min(f1, f2):
+        t_opt = float(scan_ts[best_scan])
+
+    # Build final CCP at the point that was evaluated
+    ccp_x, ccp_y = probe_point(t_opt)
+    _, transformer_usage = cost_at_point(ccp_x, ccp_y)
+    return CCP(0, ccp_x, ccp_y, transformer_usage)
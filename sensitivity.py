@@ -0,0 +1,103 @@
+import logging
+import sys
+import numpy as np
+from config import CableType, TransformerType
+from network import pairwise_dist_sq, bundle_cost_table
+from optimizer import (
+    optimize_ccp_on_ray,
+    compute_export_rates,
+    total_system_cost,
+    total_system_costs,
+)
+from main import generate_turbine_layout
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Catalogs from the assignment, kept here so editing main.py for sensitivity analysis
+# does not change what this check compares against
+MV_CABLES = [CableType("mv1", 58.29, 1110), CableType("mv2", 90.87, 1515)]
+HV_CABLES = [CableType("hv1", 404.67, 1926), CableType("hv2", 490.41, 2475)]
+TRANSFORMERS = [
+    TransformerType("tr1", 180, 3.09e6),
+    TransformerType("tr2", 360, 5.16e6),
+]
+
+
+def alpha_sweep(
+    num_rows: int,
+    num_cols: int,
+    alphas: np.ndarray,
+    turbine_power: float = 12.0,
+    num_grid: int = 200,
+    rel_tol: float = 1e-3,
+) -> list[float]:
+    """
+    Scale the transformer costs by each alpha and compare the optimized CCP against
+    the cheapest of num_grid + 1 evenly spaced points on the same ray.
+    Returns the alphas where the optimizer is more than rel_tol worse than the grid.
+    """
+    turbines, turbine_coords = generate_turbine_layout(num_rows, num_cols)
+    turbine_xs, turbine_ys = turbine_coords[:, 0], turbine_coords[:, 1]
+    turbine_dists_sq = pairwise_dist_sq(turbine_coords)
+    bundle_cost_per_meter = bundle_cost_table(len(turbines), MV_CABLES, turbine_power)
+    grid_ts = np.linspace(0.0, 1.0, num_grid + 1)
+    grid_xs = np.round(grid_ts * turbine_xs.mean(), 2)
+    grid_ys = np.round(grid_ts * turbine_ys.mean(), 2)
+
+    failures = []
+    for alpha in alphas:
+        transformers = [
+            TransformerType(tr.name, tr.rated_power, tr.cost * alpha)
+            for tr in TRANSFORMERS
+        ]
+        export_rates = compute_export_rates(
+            turbine_power * len(turbines), MV_CABLES, HV_CABLES, transformers
+        )
+        ccp = optimize_ccp_on_ray(
+            turbines,
+            MV_CABLES,
+            HV_CABLES,
+            transformers,
+            turbine_power,
+            turbine_dists_sq=turbine_dists_sq,
+            turbine_coords=turbine_coords,
+        )
+        cost, _ = total_system_cost(
+            ccp.x,
+            ccp.y,
+            turbine_xs,
+            turbine_ys,
+            turbine_dists_sq,
+            bundle_cost_per_meter,
+            export_rates,
+        )
+        grid_cost = total_system_costs(
+            grid_xs,
+            grid_ys,
+            turbine_xs,
+            turbine_ys,
+            turbine_dists_sq,
+            bundle_cost_per_meter,
+            export_rates,
+        ).min()
+        logger.info(
+            f"{num_rows} x {num_cols}, alpha = {alpha:.2f}: cost = ${cost:,.2f} "
+            f"(grid ${grid_cost:,.2f}), Transformer Usage = {ccp.transformer_usage}"
+        )
+        if cost > grid_cost * (1 + rel_tol):
+            failures.append(float(alpha))
+    return failures
+
+
+if __name__ == "__main__":
+    alphas = np.arange(0.5, 25.01, 0.25)
+    failed = False
+    for num_rows, num_cols in [(4, 7), (6, 10)]:
+        failures = alpha_sweep(num_rows, num_cols, alphas)
+        if failures:
+            logger.error(f"{num_rows} x {num_cols} worse than the grid at {failures}")
+            failed = True
+    sys.exit(1 if failed else 0)